@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="stock",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("current_price__gt", 0)),
+                name="stock_price_positive",
+            ),
+        ),
+    ]
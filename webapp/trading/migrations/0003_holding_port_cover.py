@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-15 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0002_stock_stock_price_positive"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="stockholding",
+            name="trading_sto_portfol_6911fb_idx",
+        ),
+        migrations.AddIndex(
+            model_name="stockholding",
+            index=models.Index(
+                fields=["portfolio", "stock"],
+                include=("quantity",),
+                name="holding_port_cover",
+            ),
+        ),
+    ]
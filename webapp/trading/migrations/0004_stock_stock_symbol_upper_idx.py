@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-15 10:21
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0003_holding_port_cover"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="stock",
+            index=models.Index(
+                django.db.models.functions.text.Upper("symbol"),
+                name="stock_symbol_upper_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-15 11:03
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0004_stock_stock_symbol_upper_idx"),
+    ]
+
+    operations = [
+        # Generated columns cannot be altered in place, so the stored column is
+        # dropped and re-added; the database computes it for existing rows.
+        migrations.RemoveField(
+            model_name="transaction",
+            name="total_amount",
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="total_amount",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("price"), "*", models.F("quantity")
+                ),
+                output_field=models.DecimalField(decimal_places=2, max_digits=14),
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-15 11:47
+
+from django.db import migrations, models
+
+# Mapping from the old varchar codes to the new integer codes
+TRANSACTION_TYPE_CODES = {"BUY": 1, "SELL": 2}
+
+
+def convert_transaction_types(apps, schema_editor):
+    Transaction = apps.get_model("trading", "Transaction")
+    for code, value in TRANSACTION_TYPE_CODES.items():
+        Transaction.objects.filter(transaction_type=code).update(
+            transaction_type_code=value
+        )
+
+
+def revert_transaction_types(apps, schema_editor):
+    Transaction = apps.get_model("trading", "Transaction")
+    for code, value in TRANSACTION_TYPE_CODES.items():
+        Transaction.objects.filter(transaction_type_code=value).update(
+            transaction_type=code
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0005_transaction_total_amount_generated"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="transaction_type_code",
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(convert_transaction_types, revert_transaction_types),
+        migrations.RemoveField(
+            model_name="transaction",
+            name="transaction_type",
+        ),
+        migrations.RenameField(
+            model_name="transaction",
+            old_name="transaction_type_code",
+            new_name="transaction_type",
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="transaction_type",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "Buy"), (2, "Sell")]
+            ),
+        ),
+    ]
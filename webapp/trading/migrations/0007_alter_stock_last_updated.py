@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-15 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("trading", "0006_transaction_transaction_type_smallint"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="stock",
+            name="last_updated",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,8 +1,27 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, Upper
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from decimal import Decimal
+from functools import partial
+
+def holdings_value(prefix=''):
+    """
+    Returns the aggregate expression for the market value of StockHolding rows.
+    
+    Coalesce keeps the result a Decimal when there are no holdings to sum.
+    
+    Args:
+        prefix: Lookup path to the holdings, e.g. 'holdings__' when aggregating from Portfolio
+    """
+    return Coalesce(
+        Sum(F(f'{prefix}stock__current_price') * F(f'{prefix}quantity')),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=20, decimal_places=2)
+    )
 
 class Stock(models.Model):
     """
@@ -15,13 +34,19 @@ class Stock(models.Model):
     symbol = models.CharField(max_length=10, unique=True, db_index=True)  # Stock ticker symbol (e.g., AAPL for Apple)
     name = models.CharField(max_length=100)  # Full company name
     current_price = models.DecimalField(max_digits=10, decimal_places=2)  # Current stock price
-    last_updated = models.DateTimeField(default=timezone.now)  # Timestamp of last price update
+    last_updated = models.DateTimeField(auto_now=True)  # Timestamp of the last save, e.g. a price update
 
     class Meta:
         # Adding indexes to improve query performance for common search fields
         indexes = [
             models.Index(fields=['symbol']),
-            models.Index(fields=['name'])
+            models.Index(fields=['name']),
+            # Functional index so case-insensitive symbol lookups (symbol__iexact) stay index probes
+            models.Index(Upper('symbol'), name='stock_symbol_upper_idx')
+        ]
+        # Enforce positive prices in the database so writes don't need Python validation
+        constraints = [
+            models.CheckConstraint(condition=Q(current_price__gt=0), name='stock_price_positive')
         ]
 
     def clean(self):
@@ -36,9 +61,10 @@ class Stock(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Overrides the save method to ensure data validation before saving to the database
+        Overrides the save method to normalize the symbol to uppercase.
+        Price positivity is enforced by the stock_price_positive constraint.
         """
-        self.clean()
+        self.symbol = self.symbol.upper()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -57,6 +83,49 @@ class Portfolio(models.Model):
     balance = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)  # Cash balance available for trading
     created_at = models.DateTimeField(auto_now_add=True)  # When the portfolio was created
 
+    ID_CACHE_TIMEOUT = 3600  # Seconds a cached user -> portfolio id mapping stays valid
+
+    def save(self, *args, **kwargs):
+        """
+        Overrides the save method to cache the user's portfolio id when the portfolio is created
+        """
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            transaction.on_commit(partial(
+                cache.set, self.id_cache_key(self.user_id), self.pk, self.ID_CACHE_TIMEOUT
+            ))
+
+    def delete(self, *args, **kwargs):
+        """Removes the cached portfolio id along with the portfolio"""
+        transaction.on_commit(partial(cache.delete, self.id_cache_key(self.user_id)))
+        return super().delete(*args, **kwargs)
+
+    @staticmethod
+    def id_cache_key(user_id):
+        """Returns the cache key used to store the portfolio id of the given user"""
+        return f"user:{user_id}:pf"
+
+    @classmethod
+    def get_cached_id(cls, user_id):
+        """
+        Returns the id of the user's portfolio, reading from the cache when possible.
+        
+        Deletes that bypass Portfolio.delete (such as cascades from User) leave a
+        stale entry behind; buy_stock drops it when the portfolio turns out to be missing.
+        
+        Args:
+            user_id: The id of the portfolio owner
+            
+        Raises:
+            Portfolio.DoesNotExist: If the user has no portfolio
+        """
+        return cache.get_or_set(
+            cls.id_cache_key(user_id),
+            lambda: cls.objects.values_list('id', flat=True).get(user_id=user_id),
+            cls.ID_CACHE_TIMEOUT
+        )
+
     def can_buy_stock(self, stock, quantity):
         """
         Determines if the user has sufficient funds to purchase the specified quantity of a stock
@@ -67,14 +136,26 @@ class Portfolio(models.Model):
             
         Returns:
             bool: True if user has enough funds, False otherwise
+            
+        Raises:
+            TypeError: If quantity is not an integer
         """
-        total_cost = stock.current_price * Decimal(quantity)
+        if not isinstance(quantity, int):
+            raise TypeError("Quantity must be an integer")
+        # Decimal * int already yields a Decimal, so quantity needs no conversion
+        total_cost = stock.current_price * quantity
         return self.balance >= total_cost
 
+    @transaction.atomic
     def buy_stock(self, stock, quantity):
         """
         Executes a stock purchase if the user has sufficient funds.
         
+        The purchase runs in a single database transaction. Funds are checked
+        and deducted by one conditional UPDATE, so concurrent purchases cannot
+        overdraw the balance and no row lock is needed. Only pk and user_id
+        need to be set on the portfolio instance.
+        
         This method:
         1. Verifies sufficient funds
         2. Deducts the cost from the user's balance
@@ -87,31 +168,48 @@ class Portfolio(models.Model):
             
         Raises:
             ValidationError: If the user has insufficient funds
+            Portfolio.DoesNotExist: If the portfolio no longer exists
+            TypeError: If quantity is not an integer
+            ValueError: If quantity is not positive
         """
-        if not self.can_buy_stock(stock, quantity):
+        if not isinstance(quantity, int):
+            raise TypeError("Quantity must be an integer")
+        # A non-positive quantity would make the cost negative and credit the balance
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+
+        # Deduct the cost only if the balance covers it
+        total_cost = stock.current_price * quantity
+        portfolio = Portfolio.objects.filter(pk=self.pk, user_id=self.user_id)
+        updated = portfolio.filter(balance__gte=total_cost).update(
+            balance=F('balance') - total_cost
+        )
+        if not updated:
+            # No matching row means either the funds are short or the portfolio is gone
+            if not portfolio.exists():
+                cache.delete(self.id_cache_key(self.user_id))
+                raise Portfolio.DoesNotExist("Portfolio not found")
             raise ValidationError("Insufficient funds")
-        
-        total_cost = stock.current_price * Decimal(quantity)
-        self.balance -= total_cost
-        self.save()
 
-        # Get or create a holding for this stock
-        holding, created = StockHolding.objects.get_or_create(
+        # Get or create a holding for this stock and increment it in SQL
+        StockHolding.objects.get_or_create(
             portfolio=self,
             stock=stock,
             defaults={'quantity': 0}
         )
-        holding.quantity += quantity
-        holding.save()
+        StockHolding.objects.filter(portfolio=self, stock=stock).update(
+            quantity=F('quantity') + quantity
+        )
 
         # Record the transaction
         Transaction.objects.create(
-            user=self.user,
+            user_id=self.user_id,
             stock=stock,
-            transaction_type='BUY',
+            transaction_type=Transaction.BUY,
             quantity=quantity,
             price=stock.current_price
         )
+        self.refresh_from_db(fields=['balance'])
 
     def calculate_total_value(self):
         """
@@ -122,11 +220,8 @@ class Portfolio(models.Model):
         Returns:
             Decimal: The total portfolio value
         """
-        holdings_value = sum(
-            holding.stock.current_price * holding.quantity 
-            for holding in self.holdings.all()
-        )
-        return self.balance + holdings_value
+        # Let the database multiply and sum the holdings in a single query
+        return self.balance + self.holdings.aggregate(value=holdings_value())['value']
 
     def create_daily_snapshot(self):
         """
@@ -160,7 +255,8 @@ class StockHolding(models.Model):
         unique_together = ['portfolio', 'stock']
         # Index for performance optimization for common queries
         indexes = [
-            models.Index(fields=['portfolio', 'stock'])
+            # Covers quantity so portfolio valuation reads holdings without touching the table
+            models.Index(fields=['portfolio', 'stock'], include=['quantity'], name='holding_port_cover')
         ]
 
     def clean(self):
@@ -188,18 +284,25 @@ class Transaction(models.Model):
     Each transaction captures details about what stock was traded, at what price,
     in what quantity, and by whom. Used for historical tracking and reporting.
     """
+    # Stored as small integers to keep rows and the transaction indexes narrow
+    BUY = 1
+    SELL = 2
     TRANSACTION_TYPES = [
-        ('BUY', 'Buy'),
-        ('SELL', 'Sell'),
+        (BUY, 'Buy'),
+        (SELL, 'Sell'),
     ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE)  # User who made the transaction
     stock = models.ForeignKey(Stock, on_delete=models.CASCADE)  # Stock that was traded
-    transaction_type = models.CharField(max_length=4, choices=TRANSACTION_TYPES)  # Whether it was a buy or sell
+    transaction_type = models.PositiveSmallIntegerField(choices=TRANSACTION_TYPES)  # Whether it was a buy or sell
     quantity = models.PositiveIntegerField()  # Number of shares traded
     price = models.DecimalField(max_digits=10, decimal_places=2)  # Price per share at time of transaction
     timestamp = models.DateTimeField(auto_now_add=True)  # When the transaction occurred
-    total_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True)  # Total cost/proceeds of transaction
+    total_amount = models.GeneratedField(
+        expression=F('price') * F('quantity'),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+        db_persist=True
+    )  # Total cost/proceeds of transaction, computed by the database
 
     class Meta:
         # Indexes for common queries to improve performance
@@ -208,17 +311,35 @@ class Transaction(models.Model):
             models.Index(fields=['stock', 'timestamp'])  # For stock transaction history
         ]
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def bulk_record(cls, entries):
         """
-        Overrides the save method to automatically calculate the total amount
-        for the transaction before saving
+        Records many transactions with batched INSERTs.
+        
+        save() is bypassed and signals are not sent for the created transactions.
+        total_amount is a generated column, so the database fills it in.
+        
+        Args:
+            entries: Iterable of (user, stock, transaction_type, quantity, price) tuples
+            
+        Returns:
+            list: The created Transaction objects
         """
-        self.total_amount = self.price * Decimal(self.quantity)
-        super().save(*args, **kwargs)
+        transactions = [
+            cls(
+                user=user,
+                stock=stock,
+                transaction_type=transaction_type,
+                quantity=quantity,
+                price=price
+            )
+            for user, stock, transaction_type, quantity, price in entries
+        ]
+        return cls.objects.bulk_create(transactions, batch_size=1000)
 
     def __str__(self):
         """Returns a human-readable string representation of the transaction"""
-        return f"{self.transaction_type} {self.quantity} {self.stock.symbol} @ ${self.price}"
+        return f"{self.get_transaction_type_display().upper()} {self.quantity} {self.stock.symbol} @ ${self.price}"
 
 class PortfolioSnapshot(models.Model):
     """
@@ -238,6 +359,32 @@ class PortfolioSnapshot(models.Model):
             models.Index(fields=['portfolio', 'timestamp']),
         ]
         
+    @classmethod
+    def create_for_all(cls):
+        """
+        Creates a snapshot for every portfolio in bulk.
+        
+        Balances and holdings values are read together in a single annotated
+        query, so each snapshot is consistent, and the snapshots are written
+        with batched INSERTs instead of one per portfolio.
+        
+        Returns:
+            list: The created PortfolioSnapshot objects
+        """
+        portfolios = Portfolio.objects.annotate(
+            holdings_value=holdings_value('holdings__')
+        ).values_list('id', 'balance', 'holdings_value')
+
+        snapshots = [
+            cls(
+                portfolio_id=portfolio_id,
+                total_value=balance + value,
+                cash_balance=balance
+            )
+            for portfolio_id, balance, value in portfolios
+        ]
+        return cls.objects.bulk_create(snapshots, batch_size=1000)
+
     def __str__(self):
         """Returns a human-readable string representation of the snapshot"""
         return f"{self.portfolio.user.username}'s Portfolio Value: ${self.total_value} at {self.timestamp}"
@@ -0,0 +1,112 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from decimal import Decimal
+from rest_framework import status
+from rest_framework.test import APITestCase
+from trading.models import Stock, Portfolio, StockHolding, Transaction
+from trading.views import StockCursorPagination
+
+class StockListTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('testuser', password='12345')
+        self.client.force_authenticate(user=self.user)
+        self.apple = Stock.objects.create(symbol="AAPL", name="Apple Inc.", current_price=Decimal('150.00'))
+        Stock.objects.create(symbol="MSFT", name="Microsoft", current_price=Decimal('300.00'))
+        Stock.objects.create(symbol="GOOGL", name="Google", current_price=Decimal('100.50'))
+        self.url = reverse('stock-list')
+
+    def test_list_paginates_by_symbol(self):
+        with mock.patch.object(StockCursorPagination, 'page_size', 2):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([s['symbol'] for s in response.data['results']], ['AAPL', 'GOOGL'])
+            self.assertIsNone(response.data['previous'])
+
+            response = self.client.get(response.data['next'])
+            self.assertEqual([s['symbol'] for s in response.data['results']], ['MSFT'])
+            self.assertIsNone(response.data['next'])
+
+    def test_list_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_modified_after_price_change(self):
+        etag = self.client.get(self.url)['ETag']
+        self.apple.current_price = Decimal('155.25')
+        self.apple.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_modified_after_delete(self):
+        etag = self.client.get(self.url)['ETag']
+        Stock.objects.filter(symbol="MSFT").delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BuyStockTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('testuser', password='12345')
+        self.client.force_authenticate(user=self.user)
+        self.portfolio = Portfolio.objects.create(user=self.user, balance=Decimal('1000.00'))
+        self.stock = Stock.objects.create(symbol="AAPL", name="Apple Inc.", current_price=Decimal('150.00'))
+        self.url = reverse('portfolio-buy-stock')
+
+    def test_buy_stock(self):
+        response = self.client.post(self.url, {'symbol': 'aapl', 'quantity': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'success')
+
+        self.portfolio.refresh_from_db()
+        self.assertEqual(self.portfolio.balance, Decimal('700.00'))
+        holding = StockHolding.objects.get(portfolio=self.portfolio, stock=self.stock)
+        self.assertEqual(holding.quantity, 2)
+        transaction = Transaction.objects.get(user=self.user, stock=self.stock)
+        self.assertEqual(transaction.transaction_type, Transaction.BUY)
+        self.assertEqual(transaction.price, Decimal('150.00'))
+        self.assertEqual(transaction.total_amount, Decimal('300.00'))
+
+    def test_buy_stock_insufficient_funds(self):
+        response = self.client.post(self.url, {'symbol': 'AAPL', 'quantity': 10}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'Insufficient funds for this purchase')
+
+        self.portfolio.refresh_from_db()
+        self.assertEqual(self.portfolio.balance, Decimal('1000.00'))
+        self.assertFalse(StockHolding.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_buy_stock_non_positive_quantity(self):
+        for quantity in (0, -2):
+            response = self.client.post(self.url, {'symbol': 'AAPL', 'quantity': quantity}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['message'], 'Invalid quantity provided')
+
+        self.portfolio.refresh_from_db()
+        self.assertEqual(self.portfolio.balance, Decimal('1000.00'))
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_buy_stock_with_stale_cached_portfolio_id(self):
+        # Another worker deleted and recreated the portfolio, leaving an old id cached here
+        old_id = self.portfolio.pk
+        self.portfolio.delete()
+        self.portfolio = Portfolio.objects.create(user=self.user, balance=Decimal('1000.00'))
+        cache.set(Portfolio.id_cache_key(self.user.id), old_id)
+
+        response = self.client.post(self.url, {'symbol': 'AAPL', 'quantity': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.portfolio.refresh_from_db()
+        self.assertEqual(self.portfolio.balance, Decimal('700.00'))
+        self.assertEqual(Portfolio.get_cached_id(self.user.id), self.portfolio.pk)
+
+    def test_buy_stock_without_portfolio(self):
+        other = User.objects.create_user('nopfuser', password='12345')
+        self.client.force_authenticate(user=other)
+        response = self.client.post(self.url, {'symbol': 'AAPL', 'quantity': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['message'], 'Portfolio not found')
+        self.assertFalse(Transaction.objects.exists())
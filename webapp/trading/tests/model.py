@@ -1,6 +1,8 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from decimal import Decimal
 from trading.models import Stock, Portfolio, StockHolding, Transaction
 
@@ -25,7 +27,7 @@ class StockModelTests(TestCase):
         self.assertEqual(stock.symbol, "GOOGL")
 
     def test_negative_price_validation(self):
-        with self.assertRaises(ValidationError):
+        with self.assertRaises(IntegrityError):
             Stock.objects.create(
                 symbol="MSFT",
                 name="Microsoft",
@@ -73,9 +75,78 @@ class PortfolioModelTests(TestCase):
         
         # Check transaction was recorded
         transaction = Transaction.objects.get(user=self.user, stock=self.stock)
-        self.assertEqual(transaction.transaction_type, 'BUY')
+        self.assertEqual(transaction.transaction_type, Transaction.BUY)
         self.assertEqual(transaction.quantity, 2)
+        self.assertEqual(transaction.total_amount, Decimal('300.00'))
+
+    def test_can_buy_stock_requires_integer_quantity(self):
+        with self.assertRaises(TypeError):
+            self.portfolio.can_buy_stock(self.stock, '2')
+
+    def test_buy_stock_requires_positive_quantity(self):
+        for quantity in (0, -2):
+            with self.assertRaises(ValueError):
+                self.portfolio.buy_stock(self.stock, quantity)
+        self.portfolio.refresh_from_db()
+        self.assertEqual(self.portfolio.balance, Decimal('1000.00'))
+        self.assertFalse(Transaction.objects.exists())
 
     def test_insufficient_funds(self):
         with self.assertRaises(ValidationError):
-            self.portfolio.buy_stock(self.stock, 10)
\ No newline at end of file
+            self.portfolio.buy_stock(self.stock, 10)
+        self.portfolio.refresh_from_db()
+        self.assertEqual(self.portfolio.balance, Decimal('1000.00'))
+        self.assertFalse(StockHolding.objects.filter(portfolio=self.portfolio).exists())
+
+class TransactionModelTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.apple = Stock.objects.create(symbol="AAPL", name="Apple Inc.", current_price=Decimal('150.00'))
+        self.google = Stock.objects.create(symbol="GOOGL", name="Google", current_price=Decimal('100.50'))
+
+    def test_bulk_record(self):
+        Transaction.bulk_record([
+            (self.user, self.apple, Transaction.BUY, 2, Decimal('150.00')),
+            (self.user, self.google, Transaction.BUY, 3, Decimal('100.50')),
+        ])
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.assertEqual(Transaction.objects.get(stock=self.apple).total_amount, Decimal('300.00'))
+        self.assertEqual(Transaction.objects.get(stock=self.google).total_amount, Decimal('301.50'))
+
+
+class PortfolioIdCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+
+    def test_cached_id_set_on_create(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio = Portfolio.objects.create(user=self.user, balance=Decimal('1000.00'))
+        with self.assertNumQueries(0):
+            self.assertEqual(Portfolio.get_cached_id(self.user.id), portfolio.pk)
+
+    def test_cached_id_cleared_on_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio = Portfolio.objects.create(user=self.user, balance=Decimal('1000.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio.delete()
+        with self.assertRaises(Portfolio.DoesNotExist):
+            Portfolio.get_cached_id(self.user.id)
+
+    def test_buy_with_stale_cached_id(self):
+        stock = Stock.objects.create(symbol="AAPL", name="Apple Inc.", current_price=Decimal('150.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            portfolio = Portfolio.objects.create(user=self.user, balance=Decimal('1000.00'))
+        # A queryset delete skips Portfolio.delete, like a cascade from User does
+        Portfolio.objects.filter(pk=portfolio.pk).delete()
+
+        stale = Portfolio(pk=Portfolio.get_cached_id(self.user.id), user_id=self.user.id)
+        with self.assertRaises(Portfolio.DoesNotExist):
+            stale.buy_stock(stock, 1)
+        self.assertIsNone(cache.get(Portfolio.id_cache_key(self.user.id)))
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.utils import timezone
 from decimal import Decimal
-from trading.models import Portfolio, PortfolioSnapshot, PerformanceMetric
+from trading.models import Portfolio, PortfolioSnapshot, PerformanceMetric, Stock, StockHolding
 from django.contrib.auth.models import User
 
 class PerformanceTests(TestCase):
@@ -27,4 +27,37 @@ class PerformanceTests(TestCase):
             unrealized_gain_loss=Decimal('50.00')
         )
         self.assertEqual(metric.daily_return, Decimal('1.5'))
-        self.assertEqual(metric.total_return, Decimal('5.0'))
\ No newline at end of file
+        self.assertEqual(metric.total_return, Decimal('5.0'))
+
+class PortfolioValueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('valueuser', password='12345')
+        self.portfolio = Portfolio.objects.create(
+            user=self.user,
+            balance=Decimal('1000.00')
+        )
+        self.apple = Stock.objects.create(symbol="AAPL", name="Apple Inc.", current_price=Decimal('150.00'))
+        self.google = Stock.objects.create(symbol="GOOGL", name="Google", current_price=Decimal('100.50'))
+
+    def test_total_value_without_holdings(self):
+        self.assertEqual(self.portfolio.calculate_total_value(), Decimal('1000.00'))
+
+    def test_total_value_with_holdings(self):
+        StockHolding.objects.create(portfolio=self.portfolio, stock=self.apple, quantity=2)
+        StockHolding.objects.create(portfolio=self.portfolio, stock=self.google, quantity=4)
+        with self.assertNumQueries(1):
+            total = self.portfolio.calculate_total_value()
+        self.assertEqual(total, Decimal('1702.00'))
+
+    def test_create_snapshots_for_all_portfolios(self):
+        StockHolding.objects.create(portfolio=self.portfolio, stock=self.apple, quantity=2)
+        other_user = User.objects.create_user('otheruser', password='12345')
+        other = Portfolio.objects.create(user=other_user, balance=Decimal('250.00'))
+
+        # One annotated read for balances and holdings, one batched INSERT
+        with self.assertNumQueries(2):
+            PortfolioSnapshot.create_for_all()
+
+        self.assertEqual(self.portfolio.snapshots.get().total_value, Decimal('1300.00'))
+        self.assertEqual(other.snapshots.get().total_value, Decimal('250.00'))
+        self.assertEqual(other.snapshots.get().cash_balance, Decimal('250.00'))
@@ -1,12 +1,28 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from django.urls import path
+from rest_framework.routers import APIRootView
 from .views import StockViewSet, PortfolioViewSet
 
-# Create a router and register our viewsets
-router = DefaultRouter()
-router.register(r'stocks', StockViewSet)
-router.register(r'portfolio', PortfolioViewSet, basename='portfolio')
+# Explicit routes for our small API surface, using the same names a DefaultRouter would generate
+stock_list = StockViewSet.as_view({'get': 'list'})
+stock_detail = StockViewSet.as_view({'get': 'retrieve'})
+portfolio_list = PortfolioViewSet.as_view({'get': 'list', 'post': 'create'})
+portfolio_detail = PortfolioViewSet.as_view({
+    'get': 'retrieve',
+    'put': 'update',
+    'patch': 'partial_update',
+    'delete': 'destroy'
+})
+portfolio_buy_stock = PortfolioViewSet.as_view({'post': 'buy_stock'})
+api_root = APIRootView.as_view(api_root_dict={
+    'stocks': 'stock-list',
+    'portfolio': 'portfolio-list'
+})
 
 urlpatterns = [
-    path('', include(router.urls)),
-]
\ No newline at end of file
+    path('', api_root, name='api-root'),
+    path('stocks/', stock_list, name='stock-list'),
+    path('stocks/<str:symbol>/', stock_detail, name='stock-detail'),
+    path('portfolio/', portfolio_list, name='portfolio-list'),
+    path('portfolio/buy_stock/', portfolio_buy_stock, name='portfolio-buy-stock'),
+    path('portfolio/<int:pk>/', portfolio_detail, name='portfolio-detail'),
+]
@@ -3,21 +3,77 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.pagination import CursorPagination
 from .models import Stock, Portfolio, Transaction
 from .serializers import StockSerializer, PortfolioSerializer
 from rest_framework.throttling import UserRateThrottle
 
+def _get_stock(request, symbol):
+    """
+    Returns the stock for a symbol, memoized on the request so a handler
+    that touches the same symbol more than once only loads it once.
+    """
+    stocks = getattr(request, '_stock_cache', None)
+    if stocks is None:
+        stocks = request._stock_cache = {}
+    if symbol not in stocks:
+        # Trades must use the committed price, so it is read from the database
+        stocks[symbol] = get_object_or_404(
+            Stock.objects.only('id', 'symbol', 'current_price'), symbol=symbol
+        )
+    return stocks[symbol]
+
+def _buy_for_user(user_id, stock, quantity):
+    """
+    Buys stock for the user's portfolio, built from its cached id without a query.
+    
+    A cached id can be stale when the portfolio was deleted or recreated
+    elsewhere. buy_stock drops the stale entry before raising DoesNotExist,
+    so a single retry reads the current id from the database.
+    """
+    try:
+        Portfolio(pk=Portfolio.get_cached_id(user_id), user_id=user_id).buy_stock(stock, quantity)
+    except Portfolio.DoesNotExist:
+        Portfolio(pk=Portfolio.get_cached_id(user_id), user_id=user_id).buy_stock(stock, quantity)
+
+def _stocks_etag(request, *args, **kwargs):
+    """
+    Returns an ETag for the stock list built from the latest update and the row
+    count, so edits, additions and deletions all change it
+    """
+    state = Stock.objects.aggregate(count=Count('id'), last_updated=Max('last_updated'))
+    last_updated = state['last_updated'].isoformat() if state['last_updated'] else ''
+    return f"{state['count']}-{last_updated}"
+
+class StockCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the unique symbol column, so each page is an
+    index range scan instead of an OFFSET that rescans earlier rows.
+    """
+    ordering = 'symbol'
+    page_size = 50
+
 class StockViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoints for viewing stock information.
     Provides 'list' and 'retrieve' actions.
     """
     throttle_classes = [UserRateThrottle]
-    queryset = Stock.objects.all()
+    # Load only the columns rendered by StockSerializer
+    queryset = Stock.objects.only('symbol', 'name', 'current_price', 'last_updated')
     serializer_class = StockSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'symbol'
+    pagination_class = StockCursorPagination
+
+    @method_decorator(condition(etag_func=_stocks_etag))
+    def list(self, request, *args, **kwargs):
+        """List stocks, answering conditional requests with 304 when no stock has changed"""
+        return super().list(request, *args, **kwargs)
 
 class PortfolioViewSet(viewsets.ModelViewSet):
     """
@@ -29,7 +85,8 @@ class PortfolioViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Return only the authenticated user's portfolio"""
-        return Portfolio.objects.filter(user=self.request.user)
+        # The serializer renders user as a primary key, so user_id is enough
+        return Portfolio.objects.filter(user=self.request.user).only('id', 'user_id', 'balance')
 
     @action(detail=False, methods=['post'])
     def buy_stock(self, request):
@@ -38,20 +95,26 @@ class PortfolioViewSet(viewsets.ModelViewSet):
             symbol = request.data.get('symbol')
             quantity = int(request.data.get('quantity'))
             
-            stock = get_object_or_404(Stock, symbol=symbol.upper())
-            portfolio = self.get_queryset().first()
+            symbol = symbol.upper()
+            stock = _get_stock(request, symbol)
             
-            if portfolio.can_buy_stock(stock, quantity):
-                portfolio.buy_stock(stock, quantity)
+            # The funds check and existence check both happen inside buy_stock's conditional UPDATE
+            try:
+                _buy_for_user(request.user.id, stock, quantity)
+            except Portfolio.DoesNotExist:
                 return Response({
-                    'status': 'success',
-                    'message': f'Successfully purchased {quantity} shares of {symbol}'
-                })
-            else:
+                    'status': 'error',
+                    'message': 'Portfolio not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            except DjangoValidationError:
                 return Response({
                     'status': 'error',
                     'message': 'Insufficient funds for this purchase'
                 }, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'status': 'success',
+                'message': f'Successfully purchased {quantity} shares of {symbol}'
+            })
                 
         except (ValueError, TypeError):
             return Response({
@@ -120,6 +120,10 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Covering index columns (Index.include) are only supported on PostgreSQL;
+# other backends such as the SQLite development database build plain indexes.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 